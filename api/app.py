@@ -3,13 +3,16 @@ FastAPI application for the OCR API.
 
 This module defines the FastAPI application and routes for the OCR API.
 """
-import os
-from typing import Optional
-from pathlib import Path
-from tempfile import NamedTemporaryFile
+import asyncio
+import json
+import weakref
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.formparsers import MultiPartParser
 
 from api.models import (
     OCRRequest, 
@@ -17,8 +20,10 @@ from api.models import (
     OCRBatchRequest, 
     OCRBatchResponse,
     ProcessType,
+    StreamFormat,
     HealthResponse
 )
+from config.settings import APIConfig
 from ocr.ocr_service import OCRService
 from utils.api_client import MistralClient
 from utils.exceptions import OCRToolError, InvalidInputError, APIError
@@ -28,6 +33,16 @@ from utils.logger import setup_logger
 # Configure logging
 logger = setup_logger(name="ocr_api")
 
+# Semaphores limiting the number of in-flight Mistral API calls, one per
+# event loop, since an asyncio.Semaphore can only be used from one loop
+_ocr_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Keep uploads in memory up to this size before spilling them to disk
+# (MultiPartParser.spool_max_size was added in Starlette 0.46)
+MultiPartParser.spool_max_size = APIConfig.UPLOAD_SPOOL_MAX_SIZE
+
 # Create FastAPI app
 app = FastAPI(
     title="Mistral OCR API",
@@ -45,6 +60,21 @@ app.add_middleware(
 )
 
 
+@lru_cache(maxsize=1)
+def _create_ocr_service() -> OCRService:
+    """
+    Create the shared OCR service instance.
+    
+    The service is created once and reused by all requests, so the
+    underlying Mistral HTTP connection pool is kept alive between requests.
+    
+    Returns:
+        OCRService: An initialized OCR service.
+    """
+    client = MistralClient()
+    return OCRService(client)
+
+
 def get_ocr_service():
     """
     Dependency for getting an OCR service instance.
@@ -53,13 +83,52 @@ def get_ocr_service():
         OCRService: An initialized OCR service.
     """
     try:
-        client = MistralClient()
-        return OCRService(client)
+        return _create_ocr_service()
     except OCRToolError as e:
         logger.error(f"Error initializing OCR service: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def get_ocr_semaphore() -> asyncio.Semaphore:
+    """
+    Dependency for getting the semaphore limiting concurrent OCR requests.
+    
+    The semaphore is created on first use in the running event loop.
+    
+    Returns:
+        asyncio.Semaphore: The semaphore for the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _ocr_semaphores.get(loop)
+    
+    if semaphore is None:
+        try:
+            semaphore = asyncio.Semaphore(APIConfig.get_ocr_concurrency())
+        except OCRToolError as e:
+            logger.error(f"Error initializing OCR concurrency limit: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+        _ocr_semaphores[loop] = semaphore
+    
+    return semaphore
+
+
+def to_ocr_response(item: Dict[str, Any]) -> OCRResponse:
+    """
+    Convert an OCR service result into an API response.
+    
+    The response is built without validation and the Mistral SDK response
+    model is passed through as is, so it is only traversed once, when the
+    response is serialized.
+    
+    Args:
+        item: A dictionary with the processed file name and its OCR response.
+        
+    Returns:
+        OCRResponse: The API response for the processed document.
+    """
+    return OCRResponse.model_construct(file=item["file"], response=item["response"])
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
@@ -109,40 +178,31 @@ async def process_document(
         if request.process_type == ProcessType.URL:
             # Process URL
             logger.info(f"Processing URL: {request.url}")
-            ocr_responses = ocr_service.process_documents(str(request.url))
-            
-            if not ocr_responses:
-                raise HTTPException(
-                    status_code=500, 
-                    detail="Failed to process URL"
-                )
-                
-            return ocr_responses[0]
+            ocr_response = await ocr_service.process_document_async(
+                str(request.url), 
+                include_images=request.include_images
+            )
+            return to_ocr_response(ocr_response)
         else:
             # Process file upload
             logger.info(f"Processing uploaded file: {file.filename}")
             
-            # Save uploaded file to temporary file
-            with NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as temp_file:
-                temp_file_path = temp_file.name
-                content = await file.read()
-                temp_file.write(content)
+            # Stream the uploaded file straight to the Mistral API, in a worker
+            # thread so the blocking file reads and API calls don't stall the event loop
+            ocr_responses = await asyncio.to_thread(
+                ocr_service.process_upload, 
+                file.file, 
+                file.filename, 
+                include_images=request.include_images
+            )
             
-            try:
-                # Process the temporary file
-                ocr_responses = ocr_service.process_documents(temp_file_path)
+            if not ocr_responses:
+                raise HTTPException(
+                    status_code=500, 
+                    detail="Failed to process file"
+                )
                 
-                if not ocr_responses:
-                    raise HTTPException(
-                        status_code=500, 
-                        detail="Failed to process file"
-                    )
-                    
-                return ocr_responses[0]
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+            return to_ocr_response(ocr_responses[0])
                     
     except InvalidInputError as e:
         logger.error(f"Invalid input: {str(e)}")
@@ -158,41 +218,132 @@ async def process_document(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
+async def process_batch_url(
+    ocr_service: OCRService, 
+    semaphore: asyncio.Semaphore, 
+    url: str, 
+    include_images: bool
+) -> Tuple[str, Union[OCRResponse, Exception]]:
+    """
+    Process a single URL of a batch request.
+    
+    Errors are logged and returned instead of raised, so that one failing
+    URL does not abort the rest of the batch.
+    
+    Args:
+        ocr_service: The OCR service used to process the URL.
+        semaphore: The semaphore limiting concurrent OCR requests.
+        url: The URL to process.
+        include_images: Whether to include base64-encoded images in the response.
+        
+    Returns:
+        Tuple[str, Union[OCRResponse, Exception]]: The URL and either its OCR
+        response or the error raised while processing it.
+    """
+    try:
+        async with semaphore:
+            logger.info(f"Processing URL in batch: {url}")
+            ocr_response = await ocr_service.process_document_async(url, include_images)
+            return url, to_ocr_response(ocr_response)
+    except Exception as e:
+        logger.error(f"Error processing URL {url}: {str(e)}")
+        return url, e
+
+
 @app.post("/ocr/batch", response_model=OCRBatchResponse)
 async def process_batch(
     request: OCRBatchRequest,
-    background_tasks: BackgroundTasks,
-    ocr_service: OCRService = Depends(get_ocr_service)
+    ocr_service: OCRService = Depends(get_ocr_service),
+    semaphore: asyncio.Semaphore = Depends(get_ocr_semaphore)
 ):
     """
     Process multiple documents in batch mode.
     
     Args:
         request: The batch OCR request parameters.
-        background_tasks: FastAPI background tasks.
         ocr_service: The OCR service dependency.
+        semaphore: The OCR concurrency limit dependency.
         
     Returns:
         OCRBatchResponse: The batch processing results.
     """
+    # Process all URLs concurrently
+    outcomes = await asyncio.gather(
+        *(
+            process_batch_url(ocr_service, semaphore, str(url), request.include_images)
+            for url in request.urls
+        )
+    )
+    
     results = []
     failed_urls = []
     
-    for url in request.urls:
-        try:
-            logger.info(f"Processing URL in batch: {url}")
-            ocr_responses = ocr_service.process_documents(str(url))
-            
-            if ocr_responses:
-                results.append(ocr_responses[0])
-            else:
-                failed_urls.append(str(url))
-                
-        except Exception as e:
-            logger.error(f"Error processing URL {url}: {str(e)}")
-            failed_urls.append(str(url))
+    for url, outcome in outcomes:
+        if isinstance(outcome, Exception):
+            failed_urls.append(url)
+        else:
+            results.append(outcome)
     
     return OCRBatchResponse(
         results=results,
         failed_urls=failed_urls
     )
+
+
+@app.post("/ocr/batch/stream")
+async def process_batch_stream(
+    request: OCRBatchRequest,
+    format: StreamFormat = StreamFormat.SSE,
+    ocr_service: OCRService = Depends(get_ocr_service),
+    semaphore: asyncio.Semaphore = Depends(get_ocr_semaphore)
+):
+    """
+    Process multiple documents in batch mode, streaming each result as it completes.
+    
+    Results are sent in completion order, so the client receives the first
+    result as soon as it is ready and the server does not hold the whole
+    batch in memory. The final message lists the URLs that failed.
+    
+    With the SSE format, results are sent as `result` events and the final
+    message as a `done` event. With the NDJSON format, each result is one
+    line and the final line is an object with a `failed_urls` key.
+    
+    Args:
+        request: The batch OCR request parameters.
+        format: The streaming format (sse or ndjson).
+        ocr_service: The OCR service dependency.
+        semaphore: The OCR concurrency limit dependency.
+        
+    Returns:
+        StreamingResponse: The stream of OCR responses.
+    """
+    def encode(event: str, data: str) -> str:
+        if format == StreamFormat.SSE:
+            return f"event: {event}\ndata: {data}\n\n"
+        return f"{data}\n"
+    
+    async def generate() -> AsyncIterator[str]:
+        tasks = [
+            asyncio.ensure_future(
+                process_batch_url(ocr_service, semaphore, str(url), request.include_images)
+            )
+            for url in request.urls
+        ]
+        failed_urls = []
+        
+        try:
+            for next_outcome in asyncio.as_completed(tasks):
+                url, outcome = await next_outcome
+                
+                if isinstance(outcome, Exception):
+                    failed_urls.append(url)
+                else:
+                    yield encode("result", outcome.model_dump_json())
+            
+            yield encode("done", json.dumps({"failed_urls": failed_urls}))
+        finally:
+            # Stop any remaining work if the client disconnects
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(generate(), media_type=format.media_type)
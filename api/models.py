@@ -5,8 +5,37 @@ This module defines Pydantic models for request and response data
 used in the FastAPI application.
 """
 from enum import Enum
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Any, Optional
+from urllib.parse import urlsplit
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from utils.constants import OCRConstants
+
+
+def validate_url(url: str) -> str:
+    """
+    Check that a string is an HTTP(S) URL.
+    
+    This is a lightweight check of the scheme and host; the URL is passed
+    on to the Mistral API, which reports any remaining problems. The scheme
+    is matched case-insensitively and lowercased, so the URL is recognized
+    as one by `OCRConstants.is_url` later on.
+    
+    Args:
+        url: The URL to check.
+        
+    Returns:
+        The URL, with its scheme lowercased.
+        
+    Raises:
+        ValueError: If the URL does not start with http:// or https://,
+            or has no host.
+    """
+    if not url[:8].lower().startswith(OCRConstants.URL_PREFIXES) or not urlsplit(url).hostname:
+        raise ValueError(f"Invalid URL: {url}. Must start with http:// or https:// followed by a host")
+    
+    scheme_end = url.index(":")
+    return url[:scheme_end].lower() + url[scheme_end:]
 
 
 class ProcessType(str, Enum):
@@ -16,6 +45,20 @@ class ProcessType(str, Enum):
     FILE = "file"
 
 
+class StreamFormat(str, Enum):
+    """Format of streamed batch responses."""
+    
+    SSE = "sse"
+    NDJSON = "ndjson"
+    
+    @property
+    def media_type(self) -> str:
+        """The HTTP media type for this format."""
+        if self is StreamFormat.SSE:
+            return "text/event-stream"
+        return "application/x-ndjson"
+
+
 class OCRRequest(BaseModel):
     """
     Request model for OCR processing.
@@ -29,7 +72,7 @@ class OCRRequest(BaseModel):
         ..., 
         description="Type of processing (url or file)"
     )
-    url: Optional[HttpUrl] = Field(
+    url: Optional[str] = Field(
         None, 
         description="URL of the document to process (required for URL processing)"
     )
@@ -37,28 +80,47 @@ class OCRRequest(BaseModel):
         False, 
         description="Whether to include base64-encoded images in the response"
     )
+    
+    @field_validator("url")
+    @classmethod
+    def check_url(cls, url: Optional[str]) -> Optional[str]:
+        """Validate the document URL."""
+        return url if url is None else validate_url(url)
 
 
 class OCRResponse(BaseModel):
-    """Response model for OCR processing."""
+    """
+    Response model for OCR processing.
+    
+    The OCR response data is passed through without validation, since it
+    comes straight from the Mistral SDK and can contain large base64 images.
+    """
+    
+    model_config = ConfigDict(arbitrary_types_allowed=True)
     
     file: str = Field(..., description="Filename or URL that was processed")
-    response: Dict[str, Any] = Field(..., description="OCR response data")
+    response: Any = Field(..., description="OCR response data")
 
 
 class OCRBatchRequest(BaseModel):
     """Request model for batch OCR processing."""
     
-    urls: List[HttpUrl] = Field(
+    urls: List[str] = Field(
         ..., 
         description="List of URLs to process",
-        min_items=1,
-        max_items=10
+        min_length=1,
+        max_length=10
     )
     include_images: bool = Field(
         False, 
         description="Whether to include base64-encoded images in the response"
     )
+    
+    @field_validator("urls")
+    @classmethod
+    def check_urls(cls, urls: List[str]) -> List[str]:
+        """Validate each document URL."""
+        return [validate_url(url) for url in urls]
 
 
 class OCRBatchResponse(BaseModel):
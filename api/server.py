@@ -52,6 +52,13 @@ def parse_arguments():
         help="Number of worker processes."
     )
     
+    parser.add_argument(
+        "--backlog", 
+        type=int, 
+        default=4096, 
+        help="Maximum number of pending connections."
+    )
+    
     parser.add_argument(
         "--log-level", 
         choices=["debug", "info", "warning", "error", "critical"],
@@ -93,6 +100,7 @@ def main():
             port=args.port,
             reload=args.reload,
             workers=args.workers,
+            backlog=args.backlog,
             log_level=args.log_level.lower()
         )
         
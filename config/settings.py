@@ -4,6 +4,8 @@ from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
+from utils.exceptions import ConfigurationError
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -17,6 +19,32 @@ class APIConfig:
     MISTRAL_API_KEY: Optional[str] = os.environ.get("MISTRAL_API_KEY")
     OCR_MODEL: str = "mistral-ocr-latest"
     INCLUDE_IMAGES: bool = True
+    INLINE_DOCUMENT_MAX_SIZE: int = 4 * 1024 * 1024
+    UPLOAD_SPOOL_MAX_SIZE: int = 8 * 1024 * 1024
+    
+    @classmethod
+    def get_ocr_concurrency(cls) -> int:
+        """
+        Get the maximum number of documents sent to the Mistral API at once.
+        
+        The value is read from the OCR_CONCURRENCY environment variable and
+        defaults to the number of CPU cores. It is at least 1.
+        
+        Returns:
+            The maximum number of concurrent OCR requests.
+            
+        Raises:
+            ConfigurationError: If OCR_CONCURRENCY is not an integer.
+        """
+        value = os.environ.get("OCR_CONCURRENCY")
+        
+        if value is None:
+            return os.cpu_count() or 1
+        
+        try:
+            return max(1, int(value))
+        except ValueError:
+            raise ConfigurationError(f"OCR_CONCURRENCY must be an integer, got {value!r}")
 
 # File settings
 class FileConfig:
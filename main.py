@@ -17,7 +17,8 @@ from typing import Any, Dict, List, Optional
 
 from ocr.ocr_service import OCRService
 from utils.api_client import MistralClient
-from utils.file_handler import FileHandler
+from utils.constants import OutputFormat
+from utils.file_handler import save_output
 from utils.exceptions import OCRToolError
 from utils.logger import setup_logger
 
@@ -55,6 +56,19 @@ def create_cli_parser() -> argparse.ArgumentParser:
         help="Path to the output file."
     )
     
+    cli_parser.add_argument(
+        "-f", "--format", 
+        choices=[output_format.value for output_format in OutputFormat],
+        default=OutputFormat.JSON.value, 
+        help="Format of the output file."
+    )
+    
+    cli_parser.add_argument(
+        "--pretty", 
+        action="store_true", 
+        help="Indent the JSON output for readability (json format only)."
+    )
+    
     cli_parser.add_argument(
         "-v", "--verbose", 
         action="store_true", 
@@ -98,6 +112,13 @@ def create_cli_parser() -> argparse.ArgumentParser:
         help="Number of worker processes."
     )
     
+    api_parser.add_argument(
+        "--backlog", 
+        type=int, 
+        default=4096, 
+        help="Maximum number of pending connections."
+    )
+    
     api_parser.add_argument(
         "--log-level", 
         choices=["debug", "info", "warning", "error", "critical"],
@@ -172,20 +193,28 @@ def process_documents(input_path: str, logger: logging.Logger) -> List[Dict[str,
     return ocr_service.process_documents(input_path)
 
 
-def save_results(ocr_responses: List[Dict[str, Any]], output_path: str, logger: logging.Logger) -> None:
+def save_results(
+    ocr_responses: List[Dict[str, Any]], 
+    output_path: str, 
+    output_format: OutputFormat, 
+    logger: logging.Logger,
+    pretty: bool = False
+) -> None:
     """
     Save OCR results to the specified output file.
     
     Args:
         ocr_responses: List of OCR responses.
         output_path: Path to the output file.
+        output_format: Format of the output file.
         logger: Logger instance for logging.
+        pretty: Whether to indent the JSON output.
         
     Raises:
         OCRToolError: If there is an error saving the results.
     """
     logger.info(f"Saving output to: {output_path}")
-    FileHandler.save_output(ocr_responses, output_path)
+    save_output(ocr_responses, output_path, output_format, pretty=pretty)
     logger.info("Processing completed successfully")
 
 
@@ -207,7 +236,13 @@ def run_cli_mode(args: argparse.Namespace) -> int:
         ocr_responses = process_documents(args.input, logger)
         
         # Save results
-        save_results(ocr_responses, args.output, logger)
+        save_results(
+            ocr_responses, 
+            args.output, 
+            OutputFormat(args.format), 
+            logger, 
+            pretty=args.pretty
+        )
         
         return 0
         
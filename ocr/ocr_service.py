@@ -1,10 +1,14 @@
 """OCR service for processing documents using Optical Character Recognition."""
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Union
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 
+from config.settings import APIConfig
 from utils.constants import OCRConstants
 from utils.exceptions import InvalidInputError, OCRToolError
+from utils.file_handler import prefetch
 from utils.logger import logger
 from utils.api_client import MistralClient
 
@@ -27,7 +31,11 @@ class OCRService:
         self.client = client
         logger.info("OCR service initialized")
     
-    def process_documents(self, input_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    def process_documents(
+        self, 
+        input_path: Union[str, Path], 
+        include_images: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process multiple documents from a file, directory, or URL.
         
@@ -36,6 +44,8 @@ class OCRService:
         
         Args:
             input_path: The path to the input file or directory, or a URL.
+            include_images: Whether to include base64-encoded images in the responses.
+                If None, the API client's default is used.
             
         Returns:
             A list of dictionaries containing OCR responses.
@@ -49,15 +59,19 @@ class OCRService:
         
         try:
             if OCRConstants.is_url(input_path_str):
-                ocr_responses = self._process_url(input_path_str)
-            elif os.path.isfile(input_path_str):
-                ocr_responses = self._process_file(input_path_str)
-            elif os.path.isdir(input_path_str):
-                ocr_responses = self._process_directory(input_path_str)
+                ocr_responses = self._process_url(input_path_str, include_images)
             else:
-                error_msg = f"Invalid input path: {input_path_str}. Must be a file, directory, or URL."
-                logger.error(error_msg)
-                raise InvalidInputError(error_msg)
+                # A single stat() tells files and directories apart
+                mode = self._get_file_mode(input_path_str)
+                
+                if stat.S_ISREG(mode):
+                    ocr_responses = self._process_file(input_path_str, include_images)
+                elif stat.S_ISDIR(mode):
+                    ocr_responses = self._process_directory(input_path_str, include_images)
+                else:
+                    error_msg = f"Invalid input path: {input_path_str}. Must be a file, directory, or URL."
+                    logger.error(error_msg)
+                    raise InvalidInputError(error_msg)
                 
             return ocr_responses
             
@@ -69,40 +83,111 @@ class OCRService:
             logger.error(error_msg)
             raise OCRToolError(error_msg)
     
-    def _process_url(self, url: str) -> List[Dict[str, Any]]:
+    def process_upload(
+        self, 
+        file_obj: BinaryIO, 
+        filename: str, 
+        include_images: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process an uploaded file object using OCR.
+        
+        The file object is streamed directly to the Mistral API, so the
+        upload never needs to be copied to a temporary file first.
+        
+        Args:
+            file_obj: The open binary file object to process.
+            filename: The original name of the uploaded file.
+            include_images: Whether to include base64-encoded images in the response.
+                If None, the API client's default is used.
+            
+        Returns:
+            A list containing a single OCR response.
+            
+        Raises:
+            OCRToolError: If there is an error processing the document.
+        """
+        logger.info(f"Processing uploaded file: {filename}")
+        ocr_response = self.client.process_document(
+            file_obj, 
+            filename=filename, 
+            include_images=include_images
+        )
+        return [{"file": filename, "response": ocr_response}]
+    
+    async def process_document_async(
+        self, 
+        input_path: Union[str, Path], 
+        include_images: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a single file or URL asynchronously.
+        
+        Unlike `process_documents`, this does not block the event loop while
+        waiting on the Mistral API, so several documents can be processed
+        concurrently (e.g. with `asyncio.gather`).
+        
+        Args:
+            input_path: The path to the input file, or a URL.
+            include_images: Whether to include base64-encoded images in the response.
+                If None, the API client's default is used.
+        
+        Returns:
+            A dictionary containing the OCR response.
+        
+        Raises:
+            OCRToolError: If there is an error processing the document.
+        """
+        input_path_str = str(input_path)
+        logger.info(f"Processing document asynchronously: {input_path_str}")
+        ocr_response = await self.client.process_document_async(input_path_str, include_images)
+        return {"file": input_path_str, "response": ocr_response}
+    
+    def _process_url(self, url: str, include_images: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
         Process a single URL using OCR.
         
         Args:
             url: The URL to process.
+            include_images: Whether to include base64-encoded images in the response.
             
         Returns:
             A list containing a single OCR response.
         """
         logger.info(f"Processing URL: {url}")
-        ocr_response = self.client.process_document(url)
+        ocr_response = self.client.process_document(url, include_images=include_images)
         return [{"file": url, "response": ocr_response}]
     
-    def _process_file(self, file_path: str) -> List[Dict[str, Any]]:
+    def _process_file(
+        self, 
+        file_path: str, 
+        include_images: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process a single file using OCR.
         
         Args:
             file_path: The path to the file to process.
+            include_images: Whether to include base64-encoded images in the response.
             
         Returns:
             A list containing a single OCR response.
         """
         logger.info(f"Processing file: {file_path}")
-        ocr_response = self.client.process_document(file_path)
+        ocr_response = self.client.process_document(file_path, include_images=include_images)
         return [{"file": file_path, "response": ocr_response}]
     
-    def _process_directory(self, directory_path: str) -> List[Dict[str, Any]]:
+    def _process_directory(
+        self, 
+        directory_path: str, 
+        include_images: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process all supported files in a directory using OCR.
         
         Args:
             directory_path: The path to the directory to process.
+            include_images: Whether to include base64-encoded images in the responses.
             
         Returns:
             A list of OCR responses, one for each successfully processed file.
@@ -120,22 +205,66 @@ class OCRService:
             logger.warning(f"No supported files found in directory: {directory_path}")
             return ocr_responses
         
-        # Process each file
+        # Process the files concurrently, since each one is dominated by API round-trips
+        results = {}
+        max_workers = min(len(supported_files), APIConfig.get_ocr_concurrency())
+        
+        # Let the OS read files slightly ahead of the pool, so they are in the
+        # page cache when a worker gets to them without evicting earlier ones
+        prefetch_window = 2 * max_workers
+        
+        def process_file(index: int) -> Any:
+            ahead = index + prefetch_window
+            if ahead < len(supported_files):
+                prefetch([supported_files[ahead]])
+            return self.client.process_document(
+                supported_files[index], 
+                include_images=include_images
+            )
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(process_file, index): file_path
+                for index, file_path in enumerate(supported_files)
+            }
+            
+            # The first files are already being read by the workers
+            prefetch(supported_files[max_workers:prefetch_window])
+            
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    results[file_path] = future.result()
+                except OCRToolError as e:
+                    # Log the error but continue processing other files
+                    logger.error(f"Error processing file {file_path}: {str(e)}")
+        
+        # Keep the results in directory order
         for file_path in supported_files:
-            try:
-                logger.info(f"Processing file: {file_path}")
-                ocr_response = self.client.process_document(file_path)
+            if file_path in results:
                 ocr_responses.append({
                     "file": os.path.basename(file_path), 
-                    "response": ocr_response
+                    "response": results[file_path]
                 })
-            except OCRToolError as e:
-                # Log the error but continue processing other files
-                logger.error(f"Error processing file {file_path}: {str(e)}")
-                continue
         
         return ocr_responses
     
+    @staticmethod
+    def _get_file_mode(path: str) -> int:
+        """
+        Get the file mode of a path, following symlinks.
+        
+        Args:
+            path: The path to check.
+            
+        Returns:
+            The st_mode of the path, or 0 if it does not exist or cannot be accessed.
+        """
+        try:
+            return os.stat(path).st_mode
+        except (OSError, ValueError):
+            return 0
+    
     @staticmethod
     def _get_files_in_directory(directory_path: str) -> List[str]:
         """
@@ -147,11 +276,10 @@ class OCRService:
         Returns:
             A list of file paths.
         """
-        return [
-            os.path.join(directory_path, f) 
-            for f in os.listdir(directory_path) 
-            if os.path.isfile(os.path.join(directory_path, f))
-        ]
+        # os.scandir reports the entry type from the directory listing itself,
+        # so no extra stat() call is needed per entry
+        with os.scandir(directory_path) as entries:
+            return [entry.path for entry in entries if entry.is_file()]
     
     @staticmethod
     def _filter_supported_files(files: List[str]) -> List[str]:
@@ -1,13 +1,25 @@
 """API client for interacting with the Mistral OCR API."""
+import asyncio
+import base64
+import mimetypes
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Any, BinaryIO, Dict, Optional, Union
 
 from mistralai import Mistral
 
 from config.settings import APIConfig
-from utils.constants import OCRConstants
-from utils.exceptions import APIError, ConfigurationError, FileError, UnsupportedFileTypeError
+from utils.constants import DOCUMENT_TYPE_IMAGE_URL, DOCUMENT_TYPE_URL, OCRConstants
+from utils.exceptions import (
+    FILE_NOT_FOUND_MESSAGE,
+    PERMISSION_DENIED_MESSAGE,
+    APIError,
+    ConfigurationError,
+    FileError,
+    InvalidInputError,
+    OCRToolError,
+    UnsupportedFileTypeError,
+)
 from utils.logger import logger
 
 class MistralClient:
@@ -31,97 +43,322 @@ class MistralClient:
         self.client = Mistral(api_key=self.api_key)
         logger.info("Mistral client initialized")
     
-    def process_document(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+    def process_document(
+        self, 
+        source: Union[str, Path, BinaryIO], 
+        filename: Optional[str] = None,
+        include_images: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         Process a document using the Mistral OCR API.
         
         Args:
-            file_path: The path to the document or a URL.
+            source: The path to the document, a URL, or an open binary file object.
+            filename: The name of the document. Required when `source` is a file object.
+            include_images: Whether to include base64-encoded images in the response.
+                If None, `APIConfig.INCLUDE_IMAGES` is used.
             
         Returns:
             The OCR response.
             
         Raises:
+            InvalidInputError: If a file object is given without a filename.
             UnsupportedFileTypeError: If the file type is not supported.
             FileError: If there is an error reading the file.
             APIError: If there is an error calling the API.
         """
-        file_path_str = str(file_path)
+        if isinstance(source, (str, Path)):
+            file_path_str = str(source)
+        elif filename:
+            file_path_str = filename
+        else:
+            raise InvalidInputError("A filename is required when processing a file object")
         
         try:
             # Determine if the document is a local file or a URL
-            if OCRConstants.is_url(file_path_str):
+            if isinstance(source, (str, Path)) and OCRConstants.is_url(file_path_str):
                 logger.info(f"Processing URL: {file_path_str}")
-                document = {
-                    "type": OCRConstants.DOCUMENT_TYPES["url"], 
-                    "document_url": file_path_str
-                }
-                
-                ocr_response = self.client.ocr.process(
-                    model=APIConfig.OCR_MODEL,
-                    document=document,
-                    include_image_base64=APIConfig.INCLUDE_IMAGES
-                )
-                
-                logger.info(f"Successfully processed URL: {file_path_str}")
-                return ocr_response
+                document = self._build_url_document(file_path_str)
             else:
                 # Check if the file type is supported
                 if not OCRConstants.is_supported_file(file_path_str):
                     raise UnsupportedFileTypeError(file_path_str)
                 
-                # Upload the local file
-                try:
-                    with open(file_path_str, "rb") as f:
-                        uploaded_file = self.client.files.upload(
-                            file={
-                                "file_name": os.path.basename(file_path_str), 
-                                "content": f
-                            },
-                            purpose=OCRConstants.OCR_PURPOSE
-                        )
-                except FileNotFoundError:
-                    raise FileError(f"File not found: {file_path_str}", file_path_str)
-                except PermissionError:
-                    raise FileError(f"Permission denied: {file_path_str}", file_path_str)
-                except Exception as e:
-                    raise FileError(f"Error reading file: {str(e)}", file_path_str)
-                
-                # Process the uploaded file using file_id
-                # First, check if the file is an image or a document
-                file_ext = os.path.splitext(file_path_str)[1].lower()
-                
-                if file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp']:
-                    # For image files
-                    document_type = "image_url"
+                if isinstance(source, (str, Path)):
+                    document = self._process_path(file_path_str)
                 else:
-                    # For PDF and other document files
-                    document_type = "document_url"
-                
-                # Get a signed URL for the uploaded file
-                signed_url = self.client.files.get_signed_url(file_id=uploaded_file.id)
+                    document = self._process_file_object(source, file_path_str)
+            
+            ocr_response = self.client.ocr.process(
+                model=APIConfig.OCR_MODEL,
+                document=document,
+                include_image_base64=self._resolve_include_images(include_images)
+            )
+            
+            logger.info(f"Successfully processed document: {file_path_str}")
+            return ocr_response
                 
-                # Process the uploaded file using the signed URL
-                ocr_response = self.client.ocr.process(
-                    model=APIConfig.OCR_MODEL,
-                    document={
-                        "type": document_type,
-                        f"{document_type.split('_')[0]}_url": signed_url.url
-                    },
-                    include_image_base64=APIConfig.INCLUDE_IMAGES
-                )
+        except Exception as e:
+            raise self._wrap_error(e, file_path_str)
+    
+    def _process_path(self, file_path: str) -> Dict[str, str]:
+        """
+        Build the OCR document payload for a local file, given its path.
+        
+        Args:
+            file_path: The path to the local file.
+            
+        Returns:
+            The document payload for the OCR request.
+            
+        Raises:
+            FileError: If there is an error opening or reading the file.
+        """
+        try:
+            file_obj = open(file_path, "rb")
+        except Exception as e:
+            raise self._file_error(e, file_path)
+        
+        with file_obj:
+            return self._process_file_object(file_obj, file_path)
+    
+    def _process_file_object(self, file_obj: BinaryIO, file_path: str) -> Dict[str, str]:
+        """
+        Build the OCR document payload for an open file object.
+        
+        Small files are sent inline; larger ones are uploaded, streaming
+        straight from the file object.
+        
+        Args:
+            file_obj: The open binary file object, positioned at its start.
+            file_path: The path or name of the file.
+            
+        Returns:
+            The document payload for the OCR request.
+            
+        Raises:
+            FileError: If there is an error reading or uploading the file.
+        """
+        try:
+            content = self._read_inline_content(file_obj)
+            
+            if content is None:
+                uploaded_file = self._upload_file(file_obj, file_path)
+        except Exception as e:
+            raise self._file_error(e, file_path)
+        
+        if content is not None:
+            document_url = self._build_data_url(file_path, content)
+        else:
+            # Get a signed URL for the uploaded file
+            document_url = self.client.files.get_signed_url(file_id=uploaded_file.id).url
+        
+        return self._build_file_document(file_path, document_url)
+    
+    async def process_document_async(
+        self, 
+        file_path: Union[str, Path], 
+        include_images: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a document using the Mistral OCR API without blocking the event loop.
+        
+        This is the asynchronous counterpart of `process_document`, using the
+        SDK's async HTTP client so several documents can be in flight at once.
+        Local files are read and uploaded in a worker thread.
+        
+        Args:
+            file_path: The path to the document or a URL.
+            include_images: Whether to include base64-encoded images in the response.
+                If None, `APIConfig.INCLUDE_IMAGES` is used.
+            
+        Returns:
+            The OCR response.
+            
+        Raises:
+            UnsupportedFileTypeError: If the file type is not supported.
+            FileError: If there is an error reading the file.
+            APIError: If there is an error calling the API.
+        """
+        file_path_str = str(file_path)
+        
+        try:
+            # Determine if the document is a local file or a URL
+            if OCRConstants.is_url(file_path_str):
+                logger.info(f"Processing URL: {file_path_str}")
+                document = self._build_url_document(file_path_str)
+            else:
+                # Check if the file type is supported
+                if not OCRConstants.is_supported_file(file_path_str):
+                    raise UnsupportedFileTypeError(file_path_str)
                 
-                logger.info(f"Successfully processed file: {file_path_str}")
-                return ocr_response
+                # Reading, encoding and uploading the file are blocking, so they
+                # run in a worker thread to keep the event loop free
+                document = await asyncio.to_thread(self._process_path, file_path_str)
+            
+            ocr_response = await self.client.ocr.process_async(
+                model=APIConfig.OCR_MODEL,
+                document=document,
+                include_image_base64=self._resolve_include_images(include_images)
+            )
+            
+            logger.info(f"Successfully processed document: {file_path_str}")
+            return ocr_response
                 
-        except (UnsupportedFileTypeError, FileError) as e:
-            # Re-raise these exceptions as they are already properly formatted
-            logger.error(str(e))
-            raise
         except Exception as e:
-            if "Mistral API" in str(e):
-                logger.error(f"Mistral API error: {str(e)}")
-                raise APIError(f"Mistral API error: {str(e)}")
-            else:
-                logger.error(f"Unexpected error processing document {file_path_str}: {str(e)}")
-                raise APIError(f"Unexpected error: {str(e)}")
+            raise self._wrap_error(e, file_path_str)
+    
+    @staticmethod
+    def _resolve_include_images(include_images: Optional[bool]) -> bool:
+        """
+        Resolve whether images should be included in an OCR response.
+        
+        Args:
+            include_images: The per-request setting, or None to use the default.
+            
+        Returns:
+            Whether to request base64-encoded images from the API.
+        """
+        return APIConfig.INCLUDE_IMAGES if include_images is None else include_images
+    
+    @staticmethod
+    def _read_inline_content(file_obj: BinaryIO) -> Optional[bytes]:
+        """
+        Read a file's content if it is small enough to be sent inline.
+        
+        Sending a document inline saves the upload and signed URL round-trips
+        that would otherwise be needed before the OCR request.
+        
+        Args:
+            file_obj: The open binary file object, positioned at its start.
+            
+        Returns:
+            The file content, or None if the file is too large to be sent inline.
+            In that case the file object is left positioned at its start.
+        """
+        size = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(0)
+        
+        if size > APIConfig.INLINE_DOCUMENT_MAX_SIZE:
+            return None
+        
+        return file_obj.read()
+    
+    @staticmethod
+    def _build_data_url(file_path: str, content: bytes) -> str:
+        """
+        Build a base64 data URL for a file's content.
+        
+        Args:
+            file_path: The path or name of the file, used to guess its MIME type.
+            content: The file content.
+            
+        Returns:
+            The data URL.
+        """
+        mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        return f"data:{mime_type};base64,{base64.b64encode(content).decode('ascii')}"
+    
+    def _upload_file(self, content: BinaryIO, file_path: str) -> Any:
+        """
+        Upload a file to the Mistral API for OCR processing.
+        
+        Args:
+            content: The open binary file object to upload.
+            file_path: The path or name of the file being uploaded.
+            
+        Returns:
+            The uploaded file metadata.
+        """
+        return self.client.files.upload(
+            file={
+                "file_name": os.path.basename(file_path), 
+                "content": content
+            },
+            purpose=OCRConstants.OCR_PURPOSE
+        )
+    
+    @staticmethod
+    def _build_url_document(url: str) -> Dict[str, str]:
+        """
+        Build the OCR document payload for a remote URL.
+        
+        Args:
+            url: The URL of the document.
+            
+        Returns:
+            The document payload for the OCR request.
+        """
+        return {
+            "type": DOCUMENT_TYPE_URL, 
+            "document_url": url
+        }
+    
+    @staticmethod
+    def _build_file_document(file_path: str, document_url: str) -> Dict[str, str]:
+        """
+        Build the OCR document payload for a local file.
+        
+        Args:
+            file_path: The path or name of the local file.
+            document_url: The signed URL of the uploaded file, or a data URL
+                holding its content.
+            
+        Returns:
+            The document payload for the OCR request.
+        """
+        # Check if the file is an image or a document
+        file_ext = os.path.splitext(file_path)[1].lower()
+        
+        if file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp']:
+            # For image files
+            document_type = DOCUMENT_TYPE_IMAGE_URL
+        else:
+            # For PDF and other document files
+            document_type = DOCUMENT_TYPE_URL
+        
+        # The payload key is named after the document type
+        return {
+            "type": document_type,
+            document_type: document_url
+        }
+    
+    @staticmethod
+    def _file_error(error: Exception, file_path: str) -> FileError:
+        """
+        Convert an exception raised while reading a file into a file error.
+        
+        Args:
+            error: The exception that was raised.
+            file_path: The path or name of the file being read.
+            
+        Returns:
+            The exception to raise to the caller.
+        """
+        if isinstance(error, FileNotFoundError):
+            return FileError(FILE_NOT_FOUND_MESSAGE, file_path)
+        if isinstance(error, PermissionError):
+            return FileError(PERMISSION_DENIED_MESSAGE, file_path)
+        return FileError(f"Error reading file: {str(error)}", file_path)
+    
+    @staticmethod
+    def _wrap_error(error: Exception, file_path: str) -> OCRToolError:
+        """
+        Convert an exception raised while processing a document into an OCR tool error.
+        
+        Args:
+            error: The exception that was raised.
+            file_path: The path or URL of the document being processed.
+            
+        Returns:
+            The exception to raise to the caller.
+        """
+        if isinstance(error, (UnsupportedFileTypeError, FileError)):
+            # These exceptions are already properly formatted
+            logger.error(str(error))
+            return error
+        if "Mistral API" in str(error):
+            logger.error(f"Mistral API error: {str(error)}")
+            return APIError(f"Mistral API error: {str(error)}")
+        logger.error(f"Unexpected error processing document {file_path}: {str(error)}")
+        return APIError(f"Unexpected error: {str(error)}")
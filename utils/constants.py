@@ -5,7 +5,9 @@ This module defines enums and constants used by the OCR tool,
 including document types, file extensions, and utility methods.
 """
 from enum import Enum
-from typing import Dict, List
+from functools import lru_cache
+from sys import intern
+from typing import Dict, FrozenSet, List, Tuple
 
 
 class DocumentType(Enum):
@@ -19,6 +21,60 @@ class DocumentType(Enum):
     IMAGE_URL = "image_url"
 
 
+# Plain string values of the document types, for building API requests
+# without going through the Enum on every request. Constant strings are
+# interned throughout this module, so comparisons with other interned
+# strings can succeed on identity alone.
+DOCUMENT_TYPE_URL: str = intern(DocumentType.URL.value)
+DOCUMENT_TYPE_IMAGE_URL: str = intern(DocumentType.IMAGE_URL.value)
+
+
+class OutputFormat(str, Enum):
+    """
+    Output file format enumeration.
+    
+    These values select how OCR results are written to the output file.
+    """
+    JSON = "json"  # A single JSON array
+    NDJSON = "ndjson"  # One JSON object per line
+    MSGPACK = "msgpack"  # A stream of MessagePack objects, one per result
+
+
+@lru_cache(maxsize=4096)
+def is_url(path: str) -> bool:
+    """
+    Check if a path is a URL.
+    
+    Results are cached, since the same paths are often checked more than once.
+    
+    Args:
+        path: The path to check.
+        
+    Returns:
+        True if the path starts with a URL prefix, False otherwise.
+    """
+    return path.startswith(OCRConstants.URL_PREFIXES)
+
+
+@lru_cache(maxsize=4096)
+def is_supported_file(path: str) -> bool:
+    """
+    Check if a file has a supported extension.
+    
+    Results are cached, since the same paths are often checked more than once.
+    
+    Args:
+        path: The file path to check.
+        
+    Returns:
+        True if the file has a supported extension, False otherwise.
+    """
+    # Only the tail of the path that can hold an extension is lowercased,
+    # and str.endswith checks all extensions in a single call
+    tail = path[-OCRConstants.MAX_EXTENSION_LENGTH:].lower()
+    return tail.endswith(OCRConstants.SUPPORTED_EXTENSION_SUFFIXES)
+
+
 class OCRConstants:
     """
     OCR-related constants and utility methods.
@@ -30,47 +86,51 @@ class OCRConstants:
     
     # Document types mapping
     DOCUMENT_TYPES: Dict[str, str] = {
-        "url": DocumentType.URL.value,
-        "image_url": DocumentType.IMAGE_URL.value
+        intern("url"): DOCUMENT_TYPE_URL,
+        intern("image_url"): DOCUMENT_TYPE_IMAGE_URL
     }
     
     # OCR purpose identifier for API requests
-    OCR_PURPOSE: str = "ocr"
+    OCR_PURPOSE: str = intern("ocr")
     
-    # URL prefixes for URL validation
-    URL_PREFIXES: List[str] = ["http://", "https://"]
+    # URL prefixes for URL validation, as a tuple so str.startswith
+    # can check all of them in a single call
+    URL_PREFIXES: Tuple[str, ...] = (intern("http://"), intern("https://"))
     
     # File extensions that can be processed by the OCR system
     SUPPORTED_EXTENSIONS: List[str] = [
-        ".pdf",  # PDF documents
-        ".png",  # PNG images
-        ".jpg", ".jpeg",  # JPEG images
-        ".tiff", ".tif",  # TIFF images
-        ".bmp"  # Bitmap images
+        intern(".pdf"),  # PDF documents
+        intern(".png"),  # PNG images
+        intern(".jpg"), intern(".jpeg"),  # JPEG images
+        intern(".tiff"), intern(".tif"),  # TIFF images
+        intern(".bmp")  # Bitmap images
     ]
     
-    @classmethod
-    def is_url(cls, path: str) -> bool:
-        """
-        Check if a path is a URL.
-        
-        Args:
-            path: The path to check.
-            
-        Returns:
-            True if the path starts with a URL prefix, False otherwise.
-        """
-        return any(path.startswith(prefix) for prefix in cls.URL_PREFIXES)
+    # Set of supported extensions, for constant-time lookups
+    SUPPORTED_EXTENSION_SET: FrozenSet[str] = frozenset(SUPPORTED_EXTENSIONS)
+    
+    # Tuple of supported extensions, for suffix checks with str.endswith
+    SUPPORTED_EXTENSION_SUFFIXES: Tuple[str, ...] = tuple(SUPPORTED_EXTENSIONS)
+    
+    # Length of the longest supported extension, including the leading dot
+    MAX_EXTENSION_LENGTH: int = max(map(len, SUPPORTED_EXTENSIONS))
+    
+    # Cached path classification, also available as module-level functions
+    is_url = staticmethod(is_url)
+    is_supported_file = staticmethod(is_supported_file)
     
     @classmethod
-    def is_supported_file(cls, path: str) -> bool:
+    def is_supported_extension(cls, extension: str) -> bool:
         """
-        Check if a file has a supported extension.
+        Check if a file extension is supported.
+        
+        This is a fast path for callers that already have the extension,
+        e.g. from os.path.splitext.
         
         Args:
-            path: The file path to check.
+            extension: The file extension to check, including the leading dot.
             
         Returns:
-            True if the file has a supported extension, False otherwise.
+            True if the extension is supported, False otherwise.
         """
-        return any(path.lower().endswith(ext) for ext in cls.SUPPORTED_EXTENSIONS)
+        return extension.lower() in cls.SUPPORTED_EXTENSION_SET
@@ -4,9 +4,17 @@ Custom exceptions for the OCR tool.
 This module defines a hierarchy of custom exceptions used throughout
 the OCR tool to provide clear error messages and proper error handling.
 """
+import sys
 from typing import Optional
 
 
+# Common error messages, interned so repeated errors share one string object
+FILE_NOT_FOUND_MESSAGE: str = sys.intern("File not found")
+PERMISSION_DENIED_MESSAGE: str = sys.intern("Permission denied")
+IS_A_DIRECTORY_MESSAGE: str = sys.intern("Is a directory")
+UNSUPPORTED_FILE_TYPE_MESSAGE: str = sys.intern("Unsupported file type")
+
+
 class OCRToolError(Exception):
     """
     Base exception for all OCR tool errors.
@@ -52,7 +60,7 @@ class APIError(OCRToolError):
             status_code: The HTTP status code associated with the error, if applicable.
         """
         self.status_code = status_code
-        message_with_code = f"{message}" + (f" (Status code: {status_code})" if status_code else "")
+        message_with_code = "%s (Status code: %s)" % (message, status_code) if status_code else message
         super().__init__(message_with_code)
 
 
@@ -91,7 +99,7 @@ class FileError(OCRToolError):
             file_path: The path to the file that caused the error, if applicable.
         """
         self.file_path = file_path
-        message_with_path = f"{message}" + (f" (Path: {file_path})" if file_path else "")
+        message_with_path = "%s (Path: %s)" % (message, file_path) if file_path else message
         super().__init__(message_with_path)
 
 
@@ -110,7 +118,7 @@ class UnsupportedFileTypeError(FileError):
         Args:
             file_path: The path to the unsupported file, if applicable.
         """
-        super().__init__("Unsupported file type", file_path)
+        super().__init__(UNSUPPORTED_FILE_TYPE_MESSAGE, file_path)
 
 
 class InvalidInputError(OCRToolError):
@@ -2,120 +2,536 @@
 File handling utilities for the OCR tool.
 
 This module provides utilities for file operations, including
-saving OCR responses to JSON files and handling file-related errors.
+saving OCR responses as JSON, NDJSON or MessagePack files or as
+sharded JSON chunk files, and handling file-related errors.
 """
+import io
 import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Union, Iterator
+from typing import Dict, List, Any, Callable, Optional, Set, TypeVar, Union, Iterable, Iterator
 
-from utils.exceptions import FileError
+from utils.constants import OutputFormat
+from utils.exceptions import (
+    FILE_NOT_FOUND_MESSAGE,
+    IS_A_DIRECTORY_MESSAGE,
+    PERMISSION_DENIED_MESSAGE,
+    ConfigurationError,
+    FileError,
+    InvalidInputError,
+)
 from utils.logger import logger
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    # orjson is optional; fall back to the standard library json module
+    HAS_ORJSON = False
 
-class FileHandler:
+try:
+    import msgpack
+except ImportError:
+    # msgpack is only needed for the MessagePack output format
+    msgpack = None
+
+
+# Directories already created (or found to exist) by this process
+_ensured_directories: Set[Path] = set()
+_ensured_directories_lock = threading.Lock()
+
+# Encoded output is collected up to this size before each write call
+WRITE_BUFFER_SIZE: int = 1024 * 1024
+
+T = TypeVar("T")
+
+
+def save_output(
+    ocr_responses: List[Dict[str, Any]], 
+    output_path: Union[str, Path],
+    output_format: OutputFormat = OutputFormat.JSON,
+    pretty: bool = False
+) -> None:
     """
-    File handling utilities for the OCR tool.
+    Save OCR responses to a file.
     
-    This class provides static methods for common file operations
-    used throughout the OCR tool.
+    This function serializes each OCR response object straight to the
+    output format and writes the results to the specified path, without
+    building intermediate dictionaries for the compact JSON formats. It
+    creates any necessary directories in the path if they don't exist.
+    
+    Args:
+        ocr_responses: A list of dictionaries containing OCR responses.
+        output_path: The path to save the output file.
+        output_format: The format of the output file (JSON array, NDJSON or MessagePack).
+        pretty: Whether to indent the JSON array for readability. This builds the
+            whole document in memory, so it is off by default.
+        
+    Raises:
+        InvalidInputError: If pretty output is requested for a format other than JSON.
+        ConfigurationError: If the MessagePack format is requested but msgpack is not installed.
+        FileError: If there is an error saving the file.
     """
+    if pretty and output_format != OutputFormat.JSON:
+        raise InvalidInputError(
+            f"Pretty output is only supported for the {OutputFormat.JSON.value} format"
+        )
     
-    @staticmethod
-    def save_output(ocr_responses: List[Dict[str, Any]], output_path: Union[str, Path]) -> None:
-        """
-        Save OCR responses to a JSON file.
+    if output_format == OutputFormat.MSGPACK and msgpack is None:
+        raise ConfigurationError(
+            "The msgpack package is required for MessagePack output. "
+            "Install it with: uv pip install -e '.[msgpack]'"
+        )
+    
+    # Convert to Path object for better path handling
+    path = Path(output_path)
+    
+    try:
+        # Create the directory if it doesn't exist
+        ensure_directory(path.parent)
         
-        This method converts OCR response objects to dictionaries and
-        saves them to a JSON file at the specified path. It creates
-        any necessary directories in the path if they don't exist.
+        if output_format == OutputFormat.MSGPACK:
+            chunks = _iter_msgpack(ocr_responses)
+        elif output_format == OutputFormat.NDJSON:
+            chunks = _iter_ndjson(ocr_responses)
+        elif pretty:
+            chunks = _iter_pretty_json(ocr_responses)
+        else:
+            chunks = _iter_json(ocr_responses)
         
-        Args:
-            ocr_responses: A list of dictionaries containing OCR responses.
-            output_path: The path to save the output file.
+        _write_chunks(path, chunks)
             
-        Raises:
-            FileError: If there is an error saving the file.
-        """
-        # Convert to Path object for better path handling
-        path = Path(output_path)
+        logger.info("OCR responses saved to %s", path)
         
-        try:
-            # Create the directory if it doesn't exist
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Convert OCRResponse objects to dictionaries
-            ocr_responses_dict = [
-                {
-                    "file": item["file"], 
-                    "response": item["response"].model_dump()
-                }
-                for item in ocr_responses
-            ]
-            
-            # Write to file using a context manager
-            with path.open("w") as f:
-                json.dump(ocr_responses_dict, f, indent=4)
-                
-            logger.info(f"OCR responses saved to {path}")
-            
-        except PermissionError:
-            error_msg = f"Permission denied: {path}"
-            logger.error(error_msg)
-            raise FileError(error_msg, str(path))
-        except IsADirectoryError:
-            error_msg = f"Is a directory: {path}"
-            logger.error(error_msg)
-            raise FileError(error_msg, str(path))
-        except Exception as e:
-            error_msg = f"Error saving output: {str(e)}"
-            logger.error(f"{error_msg} to {path}")
-            raise FileError(error_msg, str(path))
-    
-    @staticmethod
-    @contextmanager
-    def safe_open(file_path: Union[str, Path], mode: str = "r") -> Iterator[Any]:
-        """
-        Safely open a file with proper error handling.
-        
-        This context manager provides a safe way to open files with
-        appropriate error handling and conversion to FileError exceptions.
-        
-        Args:
-            file_path: The path to the file to open.
-            mode: The file open mode (e.g., "r", "w", "rb").
+    except PermissionError:
+        logger.error("%s: %s", PERMISSION_DENIED_MESSAGE, path)
+        raise FileError(PERMISSION_DENIED_MESSAGE, str(path))
+    except IsADirectoryError:
+        logger.error("%s: %s", IS_A_DIRECTORY_MESSAGE, path)
+        raise FileError(IS_A_DIRECTORY_MESSAGE, str(path))
+    except OSError as e:
+        error_msg = f"Error saving output: {e.strerror or e}"
+        logger.error("%s to %s", error_msg, path)
+        raise FileError(error_msg, str(path)) from e
+
+
+def save_output_streamed(
+    ocr_responses: Iterable[Dict[str, Any]], 
+    output_dir: Union[str, Path],
+    chunk_size: int = 8
+) -> List[Path]:
+    """
+    Save OCR responses to a directory of chunk files as they arrive.
+    
+    Responses are written in groups of `chunk_size`, each group as a JSON
+    array in its own file (`chunk_0000.json`, `chunk_0001.json`, ...), so
+    only one group is held in memory at a time and each file can be read
+    as soon as it is written. Once all responses are written, a
+    `manifest.json` file lists the chunk files in order along with the
+    total number of responses.
+    
+    The manifest and chunk files of a previous run in the same directory
+    are removed first, and the new manifest is only moved into place once
+    every chunk is written, so its presence marks the output as complete.
+    
+    Args:
+        ocr_responses: An iterable of dictionaries containing OCR responses,
+            e.g. a generator yielding results as they are processed.
+        output_dir: The directory to save the chunk files to.
+        chunk_size: The maximum number of responses per chunk file.
+        
+    Returns:
+        The paths of the chunk files, in order.
+        
+    Raises:
+        InvalidInputError: If the chunk size is not positive.
+        FileError: If there is an error saving the files.
+    """
+    if chunk_size < 1:
+        raise InvalidInputError(f"Chunk size must be positive, got {chunk_size}")
+    
+    # Convert to Path object for better path handling
+    directory = Path(output_dir)
+    chunk_paths: List[Path] = []
+    total = 0
+    
+    try:
+        # Create the directory if it doesn't exist
+        ensure_directory(directory)
+        
+        # Remove the output of a previous run, starting with its manifest
+        manifest_path = directory / "manifest.json"
+        manifest_path.unlink(missing_ok=True)
+        
+        for stale_path in directory.glob("chunk_*.json"):
+            stale_path.unlink(missing_ok=True)
+        
+        batch = []
+        
+        for item in ocr_responses:
+            batch.append(item)
             
-        Yields:
-            The opened file object.
+            if len(batch) == chunk_size:
+                chunk_paths.append(_write_chunk_file(directory, len(chunk_paths), batch))
+                total += len(batch)
+                batch = []
+        
+        if batch:
+            chunk_paths.append(_write_chunk_file(directory, len(chunk_paths), batch))
+            total += len(batch)
+        
+        manifest = {
+            "chunks": [chunk_path.name for chunk_path in chunk_paths], 
+            "total": total
+        }
+        temp_manifest_path = directory / "manifest.json.tmp"
+        _write_chunks(temp_manifest_path, [_encode_json(manifest)])
+        os.replace(temp_manifest_path, manifest_path)
+        
+        logger.info("%d OCR responses saved to %d chunks in %s", total, len(chunk_paths), directory)
+        return chunk_paths
+        
+    except PermissionError:
+        logger.error("%s: %s", PERMISSION_DENIED_MESSAGE, directory)
+        raise FileError(PERMISSION_DENIED_MESSAGE, str(directory))
+    except OSError as e:
+        error_msg = f"Error saving output: {e.strerror or e}"
+        logger.error("%s to %s", error_msg, directory)
+        raise FileError(error_msg, str(directory)) from e
+
+
+def _write_chunk_file(directory: Path, index: int, ocr_responses: List[Dict[str, Any]]) -> Path:
+    """
+    Write one chunk of OCR responses as a JSON array.
+    
+    Args:
+        directory: The directory to write the chunk file to.
+        index: The index of the chunk, used in the file name.
+        ocr_responses: The OCR responses in the chunk.
+        
+    Returns:
+        The path of the chunk file.
+    """
+    path = directory / f"chunk_{index:04d}.json"
+    _write_chunks(path, _iter_json(ocr_responses))
+    logger.debug("Saved chunk %d to %s", index, path)
+    return path
+
+
+def ensure_directory(directory: Path) -> None:
+    """
+    Create a directory and its parents if they don't exist.
+    
+    Directories are remembered once created, so saving several files
+    to the same directory only touches the file system the first time.
+    
+    Args:
+        directory: The directory to create.
+    """
+    # absolute() does not touch the file system, unlike resolve()
+    directory = directory.absolute()
+    
+    if directory in _ensured_directories:
+        return
+    
+    with _ensured_directories_lock:
+        if directory not in _ensured_directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            _ensured_directories.add(directory)
+
+
+def _write_chunks(path: Path, chunks: Iterable[bytes]) -> None:
+    """
+    Write chunks of bytes to a file, replacing any existing content.
+    
+    The file is written through an unbuffered `io.FileIO`, bypassing
+    Python's text and buffering layers since the chunks are already
+    encoded. Small chunks are collected in a single buffer and written
+    once it reaches `WRITE_BUFFER_SIZE`, so the number of write calls
+    depends on the output size rather than on the number of results.
+    
+    Full buffers are written by a background thread while the next one
+    is being encoded, since writes release the GIL but encoding with
+    Pydantic does not. Outputs smaller than one buffer are written
+    directly, without starting a thread.
+    
+    Args:
+        path: The path of the output file.
+        chunks: The chunks of bytes to write, in order.
+    """
+    buffer = bytearray()
+    pending: Optional[Future] = None
+    
+    # The writer is shut down (waiting for its last write) before the file is closed
+    with _open_output(path) as file, ThreadPoolExecutor(max_workers=1) as writer:
+        for chunk in chunks:
+            buffer += chunk
             
-        Raises:
-            FileError: If there is an error opening the file.
-        """
-        path = Path(file_path)
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                # Keep at most one write in flight, so writes stay in order
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(_write_all, file, buffer)
+                buffer = bytearray()
         
-        try:
-            # Create parent directories if writing
-            if "w" in mode:
-                path.parent.mkdir(parents=True, exist_ok=True)
-                
+        if pending is not None:
+            pending.result()
+        _write_all(file, buffer)
+
+
+def _open_for_writing(path: Path, opener: Callable[[Path], T]) -> T:
+    """
+    Open a file for writing, creating its directory if needed.
+    
+    If the file's directory was remembered by `ensure_directory` but has
+    since been removed, it is forgotten, created again and the file is
+    opened once more.
+    
+    Args:
+        path: The path of the file.
+        opener: The function that opens the file, given its path.
+        
+    Returns:
+        The file object returned by `opener`.
+    """
+    ensure_directory(path.parent)
+    
+    try:
+        return opener(path)
+    except FileNotFoundError:
+        with _ensured_directories_lock:
+            _ensured_directories.discard(path.parent.absolute())
+        
+        ensure_directory(path.parent)
+        return opener(path)
+
+
+def _open_output(path: Path) -> io.FileIO:
+    """
+    Open an output file for writing, replacing any existing content.
+    
+    Args:
+        path: The path of the output file.
+        
+    Returns:
+        The unbuffered file object.
+    """
+    return _open_for_writing(path, lambda output_path: io.FileIO(output_path, "w"))
+
+
+def _write_all(file: io.FileIO, data: bytearray) -> None:
+    """
+    Write all of the data to an unbuffered file, retrying short writes.
+    
+    Args:
+        file: The file to write to.
+        data: The bytes to write.
+    """
+    view = memoryview(data)
+    
+    while view:
+        written = file.write(view)
+        view = view[written:]
+
+
+def _iter_json(ocr_responses: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode OCR responses as a single JSON array.
+    
+    Args:
+        ocr_responses: An iterable of dictionaries containing OCR responses.
+        
+    Yields:
+        Chunks of the encoded array, which are only joined in the write buffer.
+    """
+    first = True
+    
+    for item in ocr_responses:
+        yield b"[" if first else b","
+        yield from _iter_record(item)
+        first = False
+    
+    # The opening bracket is only written along with the first response
+    yield b"[]" if first else b"]"
+
+
+def _iter_pretty_json(ocr_responses: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode OCR responses as a single indented JSON array.
+    
+    Args:
+        ocr_responses: An iterable of dictionaries containing OCR responses.
+        
+    Yields:
+        The encoded array.
+    """
+    records = [
+        {"file": item["file"], "response": item["response"].model_dump(mode="json")}
+        for item in ocr_responses
+    ]
+    yield _encode_json(records, indent=True)
+
+
+def _iter_ndjson(ocr_responses: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode OCR responses as newline-delimited JSON, one response per line.
+    
+    Args:
+        ocr_responses: A list of dictionaries containing OCR responses.
+        
+    Yields:
+        Chunks of the encoded lines, which are only joined in the write buffer.
+    """
+    for item in ocr_responses:
+        # The newline is appended to the record's closing brace
+        yield from _iter_record(item, end=b"}\n")
+
+
+def _iter_msgpack(ocr_responses: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode OCR responses as a stream of MessagePack objects, one per response.
+    
+    Args:
+        ocr_responses: A list of dictionaries containing OCR responses.
+        
+    Yields:
+        The encoded objects.
+    """
+    for item in ocr_responses:
+        record = {
+            "file": item["file"], 
+            "response": item["response"].model_dump(mode="json")
+        }
+        yield msgpack.packb(record, use_bin_type=True)
+
+
+def _iter_record(item: Dict[str, Any], end: bytes = b"}") -> Iterator[bytes]:
+    """
+    Encode a single OCR result as a JSON object.
+    
+    The OCR response object is serialized directly by Pydantic, so no
+    intermediate dictionary is built. The parts of the object are yielded
+    separately rather than joined, so each encoded response is only copied
+    once, into the write buffer.
+    
+    Args:
+        item: A dictionary with the file name and its OCR response.
+        end: The bytes closing the object, e.g. to add a line break.
+        
+    Yields:
+        The UTF-8 encoded parts of the JSON object.
+    """
+    yield b'{"file":'
+    yield _encode_json(item["file"])
+    yield b',"response":'
+    yield item["response"].model_dump_json().encode("utf-8")
+    yield end
+
+
+def _encode_json(value: Any, indent: bool = False) -> bytes:
+    """
+    Encode a value as JSON, using orjson when it is available.
+    
+    Args:
+        value: The value to encode.
+        indent: Whether to indent the output with two spaces per level.
+        
+    Returns:
+        The UTF-8 encoded JSON representation of the value.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(value, indent=2 if indent else None).encode("utf-8")
+
+
+@contextmanager
+def safe_open(file_path: Union[str, Path], mode: str = "r") -> Iterator[Any]:
+    """
+    Safely open a file with proper error handling.
+    
+    This context manager provides a safe way to open files with
+    appropriate error handling and conversion to FileError exceptions.
+    
+    Args:
+        file_path: The path to the file to open.
+        mode: The file open mode (e.g., "r", "w", "rb").
+        
+    Yields:
+        The opened file object.
+        
+    Raises:
+        FileError: If there is an error opening the file.
+    """
+    path = Path(file_path)
+    
+    try:
+        # Create parent directories if writing
+        if "w" in mode:
+            file = _open_for_writing(path, lambda file_path: file_path.open(mode))
+        else:
             file = path.open(mode)
-            try:
-                yield file
-            finally:
-                file.close()
-        except FileNotFoundError:
-            error_msg = f"File not found: {path}"
-            logger.error(error_msg)
-            raise FileError(error_msg, str(path))
-        except PermissionError:
-            error_msg = f"Permission denied: {path}"
-            logger.error(error_msg)
-            raise FileError(error_msg, str(path))
-        except IsADirectoryError:
-            error_msg = f"Is a directory: {path}"
-            logger.error(error_msg)
-            raise FileError(error_msg, str(path))
-        except Exception as e:
-            error_msg = f"Error accessing file: {str(e)}"
-            logger.error(f"{error_msg} - {path}")
-            raise FileError(error_msg, str(path))
+        
+        with file:
+            yield file
+    except FileNotFoundError:
+        logger.error("%s: %s", FILE_NOT_FOUND_MESSAGE, path)
+        raise FileError(FILE_NOT_FOUND_MESSAGE, str(path))
+    except PermissionError:
+        logger.error("%s: %s", PERMISSION_DENIED_MESSAGE, path)
+        raise FileError(PERMISSION_DENIED_MESSAGE, str(path))
+    except IsADirectoryError:
+        logger.error("%s: %s", IS_A_DIRECTORY_MESSAGE, path)
+        raise FileError(IS_A_DIRECTORY_MESSAGE, str(path))
+    except OSError as e:
+        error_msg = f"Error accessing file: {e.strerror or e}"
+        logger.error("%s - %s", error_msg, path)
+        raise FileError(error_msg, str(path)) from e
+
+
+def prefetch(file_paths: Iterable[Union[str, Path]]) -> None:
+    """
+    Ask the operating system to start reading files into the page cache.
+    
+    This issues a POSIX_FADV_WILLNEED hint for each file, so the kernel
+    reads all of them in the background and in parallel before they are
+    uploaded. It is a best-effort optimization: on platforms without
+    posix_fadvise (e.g. Windows and macOS) it does nothing, and files
+    that cannot be opened are skipped.
+    
+    Args:
+        file_paths: The paths of the files that are about to be read.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError as e:
+            logger.debug("Skipping prefetch of %s: %s", file_path, e)
+            continue
+        
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError as e:
+            logger.debug("Skipping prefetch of %s: %s", file_path, e)
+        finally:
+            os.close(fd)
+
+
+class FileHandler:
+    """
+    File handling utilities for the OCR tool.
+    
+    This class groups the module's file operations as static methods,
+    for callers that use them through the class.
+    """
+    
+    save_output = staticmethod(save_output)
+    save_output_streamed = staticmethod(save_output_streamed)
+    ensure_directory = staticmethod(ensure_directory)
+    safe_open = staticmethod(safe_open)
+    prefetch = staticmethod(prefetch)
@@ -5,9 +5,11 @@ This module provides logging functionality for the OCR tool,
 including configurable console and file logging.
 """
 import logging
+import os
 import sys
+import time
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Any, Dict, Literal, Mapping, Optional, Tuple
 
 
 class LoggerConfig:
@@ -32,6 +34,64 @@ class LoggerConfig:
     }
 
 
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Log formatter that formats the record time at most once per second.
+    
+    Formatting `%(asctime)s` calls `time.localtime` and `time.strftime` for
+    every record. Since the formatted time only changes once per second,
+    this formatter keeps the last formatted second and only appends the
+    milliseconds for records within the same second.
+    """
+    
+    def __init__(
+        self, 
+        fmt: Optional[str] = None, 
+        datefmt: Optional[str] = None, 
+        style: Literal["%", "{", "$"] = "%", 
+        validate: bool = True, 
+        *, 
+        defaults: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        """
+        Initialize the formatter with an empty time cache.
+        
+        The arguments are the same as for `logging.Formatter`.
+        """
+        super().__init__(fmt, datefmt, style, validate, defaults=defaults)
+        # The last formatted second and its string, stored together so that
+        # concurrent handlers never see a mismatched pair
+        self._cached_time: Tuple[int, Optional[str], str] = (-1, None, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """
+        Format the creation time of a log record.
+        
+        Args:
+            record: The log record.
+            datefmt: The date format string. If None, the default format is used
+                and milliseconds are appended, as in `logging.Formatter`.
+            
+        Returns:
+            The formatted time.
+        """
+        second = int(record.created)
+        cached_second, cached_datefmt, formatted = self._cached_time
+        
+        if second != cached_second or datefmt != cached_datefmt:
+            formatted = time.strftime(
+                datefmt or self.default_time_format, 
+                self.converter(record.created)
+            )
+            self._cached_time = (second, datefmt, formatted)
+        
+        if datefmt:
+            return formatted
+        if self.default_msec_format:
+            return self.default_msec_format % (formatted, record.msecs)
+        return formatted
+
+
 def setup_logger(
     name: str = LoggerConfig.DEFAULT_NAME,
     log_file: Optional[Path] = None,
@@ -59,7 +119,7 @@ def setup_logger(
     if log_format is None:
         log_format = LoggerConfig.DEFAULT_FORMAT
     
-    formatter = logging.Formatter(log_format)
+    formatter = CachedTimeFormatter(log_format)
     
     # Get or create logger
     logger = logging.getLogger(name)
@@ -88,7 +148,7 @@ def setup_logger(
             logger.addHandler(file_handler)
         except Exception as e:
             # Log to console if file handler creation fails
-            logger.warning(f"Failed to create log file at {log_file}: {str(e)}")
+            logger.warning("Failed to create log file at %s: %s", log_file, e)
             logger.warning("Continuing with console logging only")
     
     return logger
@@ -98,6 +158,43 @@ def setup_logger(
 logger = setup_logger()
 
 
+def _is_configured(
+    logger: logging.Logger, 
+    level: int, 
+    log_file: Optional[Path] = None
+) -> bool:
+    """
+    Check if a logger is already set up as `setup_logger` would set it up.
+    
+    Args:
+        logger: The logger to check.
+        level: The expected logging level.
+        log_file: The expected log file, or None for console logging only.
+        
+    Returns:
+        True if the logger has the expected level, format and handlers, False otherwise.
+    """
+    if logger.level != level or logger.propagate:
+        return False
+    
+    expected_handlers = 2 if log_file else 1
+    
+    if len(logger.handlers) != expected_handlers:
+        return False
+    
+    for handler in logger.handlers:
+        if handler.formatter is None or handler.formatter._fmt != LoggerConfig.DEFAULT_FORMAT:
+            return False
+        
+        if isinstance(handler, logging.FileHandler):
+            if not log_file or handler.baseFilename != os.path.abspath(log_file):
+                return False
+        elif not isinstance(handler, logging.StreamHandler) or handler.stream is not sys.stdout:
+            return False
+    
+    return True
+
+
 def get_logger(
     name: str, 
     level: Optional[int] = None,
@@ -107,7 +204,9 @@ def get_logger(
     Get a configured logger with the specified name.
     
     This is a convenience function for getting a logger with a specific
-    name while inheriting the default configuration.
+    name while inheriting the default configuration. If the logger is
+    already set up with the requested level and log file, it is returned
+    as is, so repeated calls don't replace its handlers.
     
     Args:
         name: The name of the logger.
@@ -117,8 +216,14 @@ def get_logger(
     Returns:
         A configured logger instance.
     """
+    level = level or LoggerConfig.DEFAULT_LEVEL
+    logger = logging.getLogger(name)
+    
+    if _is_configured(logger, level, log_file):
+        return logger
+    
     return setup_logger(
         name=name,
-        level=level or LoggerConfig.DEFAULT_LEVEL,
+        level=level,
         log_file=log_file
     )